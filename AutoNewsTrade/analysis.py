@@ -5,6 +5,8 @@ Provides visualization and statistical analysis of the processed data.
 import os
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # batch runs only save figures; no GUI round-trips
 import matplotlib.pyplot as plt
 import seaborn as sns
 from typing import List, Dict, Optional
@@ -31,14 +33,14 @@ class EarningsAnalyzer:
     
     def load_processed_data(self, ticker: str) -> Optional[pd.DataFrame]:
         """Load processed data for a given ticker."""
-        file_path = f"{PROCESSED_DATA_DIR}/{ticker}_earnings_impact.csv"
+        file_path = f"{PROCESSED_DATA_DIR}/{ticker}_earnings_impact.parquet"
         
         if not os.path.exists(file_path):
             logger.warning(f"No processed data found for {ticker}")
             return None
         
         try:
-            df = pd.read_csv(file_path, parse_dates=['earnings_date'], index_col=0)
+            df = pd.read_parquet(file_path)
             self.results[ticker] = df
             return df
         except Exception as e:
@@ -54,7 +56,7 @@ class EarningsAnalyzer:
         else:
             df = self.results[ticker]
         
-        plt.figure(figsize=(12, 6))
+        fig = plt.figure(figsize=(12, 6))
         
         # Plot price reaction
         plt.subplot(1, 2, 1)
@@ -83,9 +85,9 @@ class EarningsAnalyzer:
         plt.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            plt.savefig(save_path, dpi=150, bbox_inches='tight')
         
-        plt.show()
+        plt.close(fig)
     
     def analyze_earnings_strategy(self, ticker: str) -> Dict:
         """Analyze a simple earnings-based trading strategy.
@@ -105,21 +107,25 @@ class EarningsAnalyzer:
         # Simple strategy: Buy 1 day before earnings, sell 1 day after
         df['strategy_return'] = df['price_reaction']
         
-        # Calculate metrics
-        win_rate = (df['strategy_return'] > 0).mean() * 100
-        avg_return = df['strategy_return'].mean()
-        avg_positive = df[df['strategy_return'] > 0]['strategy_return'].mean()
-        avg_negative = df[df['strategy_return'] <= 0]['strategy_return'].mean()
+        # Calculate metrics on the raw array; NaN reactions are skipped like pandas does
+        r = df['strategy_return'].to_numpy(dtype=np.float64)
+        wins = r > 0
+        losses = r <= 0
+        avg_return = np.nanmean(r)
+        # Equity over the non-NaN reactions only: nancumsum would start a
+        # leading NaN at 0.0 and give an all-NaN column a 0.0 drawdown
+        valid = r[~np.isnan(r)]
+        equity = np.cumsum(valid)
         
         results = {
             'ticker': ticker,
             'num_earnings': len(df),
-            'win_rate': win_rate,
+            'win_rate': wins.mean() * 100,
             'avg_return': avg_return,
-            'avg_positive_return': avg_positive,
-            'avg_negative_return': avg_negative,
-            'sharpe_ratio': df['strategy_return'].mean() / (df['strategy_return'].std() + 1e-8),
-            'max_drawdown': (df['strategy_return'].cumsum() - df['strategy_return'].cumsum().cummax()).min()
+            'avg_positive_return': r[wins].mean() if wins.any() else np.nan,
+            'avg_negative_return': r[losses].mean() if losses.any() else np.nan,
+            'sharpe_ratio': avg_return / (np.nanstd(r, ddof=1) + 1e-8),
+            'max_drawdown': (equity - np.maximum.accumulate(equity)).min() if valid.size else np.nan
         }
         
         return results
@@ -147,13 +153,13 @@ class EarningsAnalyzer:
         
         return summary
     
-    def plot_summary(self, summary: pd.DataFrame) -> None:
+    def plot_summary(self, summary: pd.DataFrame, save_path: str = None) -> None:
         """Plot summary statistics for all tickers."""
         if summary.empty:
             logger.warning("No data to plot")
             return
         
-        plt.figure(figsize=(15, 10))
+        fig = plt.figure(figsize=(15, 10))
         
         # Sort by average return
         summary = summary.sort_values('avg_return', ascending=False)
@@ -166,11 +172,7 @@ class EarningsAnalyzer:
         plt.xticks(rotation=45)
         
         # Add value labels
-        for p in ax.patches:
-            ax.annotate(f"{p.get_height():.1f}%", 
-                       (p.get_x() + p.get_width() / 2., p.get_height()), 
-                       ha='center', va='center', xytext=(0, 5), 
-                       textcoords='offset points')
+        ax.bar_label(ax.containers[0], fmt='%.1f%%', padding=3)
         
         plt.subplot(2, 1, 2)
         ax = summary.set_index('ticker')['avg_return'].plot(kind='bar', color='orange')
@@ -179,14 +181,14 @@ class EarningsAnalyzer:
         plt.xticks(rotation=45)
         
         # Add value labels
-        for p in ax.patches:
-            ax.annotate(f"{p.get_height():.2f}%", 
-                       (p.get_x() + p.get_width() / 2., p.get_height()), 
-                       ha='center', va='center', xytext=(0, 5), 
-                       textcoords='offset points')
+        ax.bar_label(ax.containers[0], fmt='%.2f%%', padding=3)
         
         plt.tight_layout()
-        plt.show()
+        
+        if save_path:
+            plt.savefig(save_path, dpi=150, bbox_inches='tight')
+        
+        plt.close(fig)
 
 def main():
     """Main function to run analysis."""
@@ -203,7 +205,7 @@ def main():
         print(summary[['ticker', 'win_rate', 'avg_return', 'sharpe_ratio']].to_string())
         
         # Plot summary
-        analyzer.plot_summary(summary)
+        analyzer.plot_summary(summary, f"{PROCESSED_DATA_DIR}/strategy_summary.png")
         
         # Plot individual ticker analysis
         for ticker in summary['ticker'].head(3):  # Plot top 3 tickers
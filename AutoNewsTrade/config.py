@@ -24,6 +24,11 @@ DEFAULT_TICKERS = [
     'PG'       # Procter & Gamble
 ]
 
+# Parallel data collection: worker threads and the minimum spacing (seconds)
+# between tickers hitting Yahoo, so concurrency still respects its rate cap
+MAX_WORKERS = 8
+REQUEST_INTERVAL = 1.0
+
 # Date ranges for historical data
 HISTORIC_START_DATE = '2018-01-01'
 HISTORIC_END_DATE = '2023-12-31'
@@ -5,6 +5,9 @@ Handles downloading and storing financial data from various sources.
 import os
 import json
 import time
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import pandas as pd
 import yfinance as yf
@@ -19,7 +22,9 @@ from config import (
     PROCESSED_DATA_DIR,
     DEFAULT_TICKERS,
     HISTORIC_START_DATE,
-    HISTORIC_END_DATE
+    HISTORIC_END_DATE,
+    MAX_WORKERS,
+    REQUEST_INTERVAL
 )
 
 # Set up logging
@@ -37,12 +42,40 @@ logger = logging.getLogger(__name__)
 os.makedirs(RAW_DATA_DIR, exist_ok=True)
 os.makedirs(PROCESSED_DATA_DIR, exist_ok=True)
 
+@functools.lru_cache(maxsize=256)
+def _ticker(symbol: str) -> yf.Ticker:
+    """Shared yf.Ticker per symbol so its fetched data is reused across get_* calls."""
+    return yf.Ticker(symbol)
+
+class RateLimiter:
+    """Spaces calls at least `interval` seconds apart across threads."""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+    
+    def wait(self) -> None:
+        """Block until the caller's slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
 class DataCollector:
     """Class for collecting financial data from various sources."""
     
     def __init__(self, api_key: str = None):
         self.api_key = api_key or ALPHA_VANTAGE_API_KEY
         self.yf = yf.Tickers(" ".join(DEFAULT_TICKERS))
+        self.rate_limiter = RateLimiter(REQUEST_INTERVAL)
+    
+    def _save_raw(self, df: pd.DataFrame, name: str) -> None:
+        """Save raw data as Parquet; it is only read back by the processor."""
+        # Parquet requires string column names (yfinance calendars use ints)
+        df.rename(columns=str).to_parquet(f"{RAW_DATA_DIR}/{name}.parquet")
         
     def get_historical_prices(self, ticker: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """Get historical price data for a given ticker."""
@@ -63,7 +96,7 @@ class DataCollector:
                 return pd.DataFrame()
                 
             # Save raw data
-            data.to_csv(f"{RAW_DATA_DIR}/{ticker}_prices.csv")
+            self._save_raw(data, f"{ticker}_prices")
             logger.info(f"Successfully downloaded price data for {ticker}")
             return data
             
@@ -71,10 +104,48 @@ class DataCollector:
             logger.error(f"Error downloading price data for {ticker}: {str(e)}")
             return pd.DataFrame()
     
+    def get_all_historical_prices(self, tickers: List[str], start_date: str = None, end_date: str = None) -> Dict[str, pd.DataFrame]:
+        """Get historical price data for several tickers in one batched download."""
+        start_date = start_date or HISTORIC_START_DATE
+        end_date = end_date or datetime.now().strftime('%Y-%m-%d')
+        results = {}
+        
+        try:
+            data = yf.download(
+                " ".join(tickers),
+                start=start_date,
+                end=end_date,
+                group_by='ticker',
+                threads=True,
+                progress=False
+            )
+        except Exception as e:
+            logger.error(f"Error downloading price data for {', '.join(tickers)}: {str(e)}")
+            return results
+        
+        if not isinstance(data.columns, pd.MultiIndex):
+            data = pd.concat({tickers[0]: data}, axis=1)
+        
+        downloaded = set(data.columns.get_level_values(0))
+        for ticker in tickers:
+            # Rows where only other tickers traded are all-NaN for this one
+            prices = data[ticker].dropna(how='all') if ticker in downloaded else pd.DataFrame()
+            
+            if prices.empty:
+                logger.warning(f"No price data found for {ticker}")
+                continue
+            
+            # Save raw data
+            self._save_raw(prices, f"{ticker}_prices")
+            logger.info(f"Successfully downloaded price data for {ticker}")
+            results[ticker] = prices
+        
+        return results
+    
     def get_earnings_calendar(self, ticker: str) -> pd.DataFrame:
         """Get upcoming earnings dates for a given ticker."""
         try:
-            stock = yf.Ticker(ticker)
+            stock = _ticker(ticker)
             calendar = stock.calendar
             
             if calendar is None or calendar.empty:
@@ -82,7 +153,7 @@ class DataCollector:
                 return pd.DataFrame()
                 
             # Save raw data
-            calendar.to_csv(f"{RAW_DATA_DIR}/{ticker}_earnings_calendar.csv")
+            self._save_raw(calendar, f"{ticker}_earnings_calendar")
             logger.info(f"Successfully downloaded earnings calendar for {ticker}")
             return calendar
             
@@ -93,7 +164,7 @@ class DataCollector:
     def get_historical_earnings(self, ticker: str) -> pd.DataFrame:
         """Get historical earnings data for a given ticker."""
         try:
-            stock = yf.Ticker(ticker)
+            stock = _ticker(ticker)
             earnings = stock.earnings
             
             if earnings is None or earnings.empty:
@@ -101,7 +172,7 @@ class DataCollector:
                 return pd.DataFrame()
                 
             # Save raw data
-            earnings.to_csv(f"{RAW_DATA_DIR}/{ticker}_historical_earnings.csv")
+            self._save_raw(earnings, f"{ticker}_historical_earnings")
             logger.info(f"Successfully downloaded historical earnings for {ticker}")
             return earnings
             
@@ -109,22 +180,26 @@ class DataCollector:
             logger.error(f"Error downloading historical earnings for {ticker}: {str(e)}")
             return pd.DataFrame()
     
-    def collect_all_data(self, tickers: List[str] = None) -> None:
-        """Collect all available data for the given tickers."""
+    def _collect_earnings(self, ticker: str) -> None:
+        """Collect earnings data for a single ticker."""
+        # Be nice to the API
+        self.rate_limiter.wait()
+        logger.info(f"Collecting earnings data for {ticker}...")
+        
+        self.get_earnings_calendar(ticker)
+        self.get_historical_earnings(ticker)
+    
+    def collect_all_data(self, tickers: List[str] = None, max_workers: int = None) -> None:
+        """Collect all available data for the given tickers in parallel."""
         tickers = tickers or DEFAULT_TICKERS
         
-        for ticker in tickers:
-            logger.info(f"Collecting data for {ticker}...")
-            
-            # Get price data
-            self.get_historical_prices(ticker)
-            
-            # Get earnings data
-            self.get_earnings_calendar(ticker)
-            self.get_historical_earnings(ticker)
-            
-            # Be nice to the API
-            time.sleep(1)
+        # Get price data for every ticker in one request
+        logger.info(f"Collecting price data for {len(tickers)} tickers...")
+        self.get_all_historical_prices(tickers)
+        
+        # Get earnings data
+        with ThreadPoolExecutor(max_workers=max_workers or MAX_WORKERS) as executor:
+            list(executor.map(self._collect_earnings, tickers))
 
 def main():
     """Main function to run data collection."""
@@ -3,6 +3,7 @@ Data processing module for AutoNewsTrade.
 Handles cleaning, transforming, and analyzing the collected financial data.
 """
 import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
@@ -21,6 +22,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DAY_NS = pd.Timedelta(days=1).value
+
+
+def _segment_stats(prefix: Tuple[np.ndarray, np.ndarray, np.ndarray], start: np.ndarray, stop: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and sample std of every rets[start:stop] segment from prefix sums."""
+    csum, csum_sq, ccount = prefix
+    count = (ccount[stop] - ccount[start]).astype(np.float64)
+    total = csum[stop] - csum[start]
+    total_sq = csum_sq[stop] - csum_sq[start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        var = (total_sq - total * mean) / (count - 1)
+    mean[count < 1] = np.nan
+    var[count < 2] = np.nan
+    return mean, np.sqrt(np.maximum(var, 0.0))
+
 class DataProcessor:
     """Class for processing and analyzing financial data."""
     
@@ -33,19 +50,19 @@ class DataProcessor:
         
         try:
             # Load price data
-            price_path = f"{RAW_DATA_DIR}/{ticker}_prices.csv"
+            price_path = f"{RAW_DATA_DIR}/{ticker}_prices.parquet"
             if os.path.exists(price_path):
-                data['prices'] = pd.read_csv(price_path, index_col=0, parse_dates=True)
+                data['prices'] = pd.read_parquet(price_path)
             
             # Load earnings calendar
-            calendar_path = f"{RAW_DATA_DIR}/{ticker}_earnings_calendar.csv"
+            calendar_path = f"{RAW_DATA_DIR}/{ticker}_earnings_calendar.parquet"
             if os.path.exists(calendar_path):
-                data['earnings_calendar'] = pd.read_csv(calendar_path, index_col=0)
+                data['earnings_calendar'] = pd.read_parquet(calendar_path)
             
             # Load historical earnings
-            earnings_path = f"{RAW_DATA_DIR}/{ticker}_historical_earnings.csv"
+            earnings_path = f"{RAW_DATA_DIR}/{ticker}_historical_earnings.parquet"
             if os.path.exists(earnings_path):
-                data['historical_earnings'] = pd.read_csv(earnings_path, index_col=0)
+                data['historical_earnings'] = pd.read_parquet(earnings_path)
                 
             return data
             
@@ -68,57 +85,60 @@ class DataProcessor:
             # Convert earnings index to datetime
             if not isinstance(earnings.index, pd.DatetimeIndex):
                 earnings.index = pd.to_datetime(earnings.index)
+            if not prices.index.is_monotonic_increasing:
+                prices = prices.sort_index()
             
-            # Initialize results
-            results = []
+            # Locate every +/- 5 day window with a single binary search per edge
+            idx_ns = prices.index.values.astype('datetime64[ns]').view(np.int64)
+            earnings_ns = earnings.index.values.astype('datetime64[ns]').view(np.int64)
+            pos = np.searchsorted(idx_ns, earnings_ns, 'left')
+            # Skip earnings dates without price data for that exact date
+            found = pos < len(idx_ns)
+            found[found] = idx_ns[pos[found]] == earnings_ns[found]
+            lo = np.searchsorted(idx_ns, earnings_ns - 5 * DAY_NS, 'left')
+            hi = np.searchsorted(idx_ns, earnings_ns + 5 * DAY_NS, 'right')
+            # Need at least one pre-earnings bar in the window
+            valid = found & (lo < pos)
             
-            # Analyze each earnings date
-            for earnings_date in earnings.index:
-                # Skip if no price data for this date
-                if earnings_date not in prices.index:
-                    continue
-                
-                # Get price data around earnings date
-                start_date = (earnings_date - pd.Timedelta(days=5)).strftime('%Y-%m-%d')
-                end_date = (earnings_date + pd.Timedelta(days=5)).strftime('%Y-%m-%d')
-                
-                # Get price data for the window
-                mask = (prices.index >= start_date) & (prices.index <= end_date)
-                window = prices.loc[mask].copy()
-                
-                if window.empty:
-                    continue
-                
-                # Calculate returns
-                window['returns'] = window['Close'].pct_change() * 100
-                
-                # Get pre and post-earnings returns
-                pre_earnings = window[window.index < earnings_date]
-                post_earnings = window[window.index >= earnings_date]
-                
-                if pre_earnings.empty or post_earnings.empty:
-                    continue
-                
-                # Calculate metrics
-                result = {
-                    'ticker': ticker,
-                    'earnings_date': earnings_date,
-                    'pre_avg_return': pre_earnings['returns'].mean(),
-                    'post_avg_return': post_earnings['returns'].mean(),
-                    'pre_volatility': pre_earnings['returns'].std(),
-                    'post_volatility': post_earnings['returns'].std(),
-                    'earnings_surprise': earnings.loc[earnings_date, 'Earnings'] if 'Earnings' in earnings.columns else np.nan,
-                    'price_reaction': (post_earnings['Close'].iloc[0] / pre_earnings['Close'].iloc[-1] - 1) * 100
-                }
-                
-                results.append(result)
-            
-            if not results:
+            if not valid.any():
                 return None
-                
+            
+            # Percentage returns computed once over the full series; rets[j] is
+            # the return into row j + 1, so the first row of each window has none
+            close = prices['Close'].to_numpy(dtype=np.float64)
+            rets = np.diff(close) / close[:-1] * 100
+            finite = np.isfinite(rets)
+            rets = np.where(finite, rets, 0.0)
+            prefix = (
+                np.concatenate(([0.0], np.cumsum(rets))),
+                np.concatenate(([0.0], np.cumsum(rets * rets))),
+                np.concatenate(([0], np.cumsum(finite)))
+            )
+            
+            lo, pos, hi = lo[valid], pos[valid], hi[valid]
+            
+            # Pre-earnings rows are lo..pos-1, post-earnings rows are pos..hi-1
+            pre_avg, pre_vol = _segment_stats(prefix, lo, pos - 1)
+            post_avg, post_vol = _segment_stats(prefix, pos - 1, hi - 1)
+            price_reaction = (close[pos] / close[pos - 1] - 1) * 100
+            
+            if 'Earnings' in earnings.columns:
+                surprise = earnings['Earnings'].to_numpy()[valid]
+            else:
+                surprise = np.nan
+            
             # Create and save results
-            results_df = pd.DataFrame(results)
-            results_df.to_csv(f"{PROCESSED_DATA_DIR}/{ticker}_earnings_impact.csv")
+            results_df = pd.DataFrame({
+                'ticker': ticker,
+                'earnings_date': earnings.index[valid],
+                'pre_avg_return': pre_avg,
+                'post_avg_return': post_avg,
+                'pre_volatility': pre_vol,
+                'post_volatility': post_vol,
+                'earnings_surprise': surprise,
+                'price_reaction': price_reaction
+            })
+            results_df.to_parquet(f"{PROCESSED_DATA_DIR}/{ticker}_earnings_impact.parquet", compression='zstd')
             
             return results_df
             
@@ -126,13 +146,17 @@ class DataProcessor:
             logger.error(f"Error processing earnings impact for {ticker}: {str(e)}")
             return None
     
-    def process_all_tickers(self, tickers: List[str] = None) -> None:
-        """Process data for all tickers."""
+    def process_all_tickers(self, tickers: List[str] = None, max_workers: int = None) -> None:
+        """Process data for all tickers in parallel worker processes."""
         tickers = tickers or DEFAULT_TICKERS
         
-        for ticker in tickers:
-            logger.info(f"Processing data for {ticker}...")
-            self.process_earnings_impact(ticker)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(self._process_one, tickers))
+    
+    def _process_one(self, ticker: str) -> None:
+        """Process data for a single ticker."""
+        logger.info(f"Processing data for {ticker}...")
+        self.process_earnings_impact(ticker)
 
 def main():
     """Main function to run data processing."""
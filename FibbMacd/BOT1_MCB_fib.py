@@ -1,5 +1,6 @@
 import ccxt
 import time
+import numpy as np
 
 exchange = ccxt.mexc({
     'apiKey': 'YOUR_API_KEY',
@@ -7,32 +8,30 @@ exchange = ccxt.mexc({
 })
 
 FIB_LEVELS = [0.5, 0.618, 0.786, 0.886, 0.927]
+FIB_LEVELS_ARR = np.array(FIB_LEVELS)
 
 def get_historical_data(symbol, limit=100):
     ohlcv = exchange.fetch_ohlcv(symbol, timeframe='15m', limit=limit)
     return ohlcv
 
 def calculate_fib_levels(high, low):
-    diff = high - low
-    return {level: low + diff * level for level in FIB_LEVELS}
+    # Ceny poziomów w kolejności FIB_LEVELS
+    return low + (high - low) * FIB_LEVELS_ARR
 
-def check_fib_intersection(current_price, fib_levels):
-    for level, price in fib_levels.items():
-        if abs(current_price - price) < 0.1:  # Tolerancja 0.1
-            return level, price
+def check_fib_intersection(current_price, fib_prices):
+    i = int(np.argmin(np.abs(fib_prices - current_price)))
+    if abs(current_price - fib_prices[i]) < 0.1:  # Tolerancja 0.1
+        return FIB_LEVELS[i], float(fib_prices[i])
     return None, None
 
 def main():
     symbol = 'US500/USD'
     while True:
         try:
-            ohlcv = get_historical_data(symbol)
-            closes = [x[4] for x in ohlcv]
-            highs = [x[2] for x in ohlcv]
-            lows = [x[3] for x in ohlcv]
+            ohlcv = np.asarray(get_historical_data(symbol), dtype=np.float64)
 
-            swing_high = max(highs)
-            swing_low = min(lows)
+            swing_high = ohlcv[:, 2].max()
+            swing_low = ohlcv[:, 3].min()
 
             fib_levels = calculate_fib_levels(swing_high, swing_low)
 
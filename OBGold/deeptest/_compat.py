@@ -0,0 +1,16 @@
+"""Optional numba acceleration; falls back to plain Python when numba is missing."""
+
+from __future__ import annotations
+
+try:
+    from numba import njit, prange  # type: ignore
+    HAVE_NUMBA = True
+except Exception:  # pragma: no cover - optional dependency
+    HAVE_NUMBA = False
+    prange = range  # type: ignore
+
+    def njit(*args, **kwargs):  # type: ignore
+        """No-op stand-in for numba.njit supporting both @njit and @njit(...)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import pandas as pd
 import numpy as np
 
+from ._compat import HAVE_NUMBA, njit
+from .metrics import _years_ns
+
 
 @dataclass
 class CostModel:
@@ -22,31 +28,251 @@ class BacktestResult:
     costs: pd.Series
 
 
-def run_backtest(df: pd.DataFrame, position: pd.Series, cost: Optional[CostModel] = None, starting_equity: float = 1.0) -> BacktestResult:
+@dataclass
+class BacktestPrep:
+    """Return-independent part of a backtest, reusable across resampled returns."""
+    pos_arr: np.ndarray
+    pos_shift: np.ndarray  # position held over each bar (previous target)
+    turnover: np.ndarray
+    bar_cost: np.ndarray
+
+
+def prepare(pos: np.ndarray, cost: Optional[CostModel] = None) -> BacktestPrep:
+    """Derive held position, turnover and per-bar costs from target positions."""
+    cost = cost or CostModel()
+    pos_shift = np.empty_like(pos)
+    pos_shift[0] = 0.0
+    pos_shift[1:] = pos[:-1]
+    turnover = np.abs(pos - pos_shift)
+    per_trade_bps = cost.commission_bps + cost.slippage_bps
+    bar_cost = turnover * (per_trade_bps / 1e4)
+    return BacktestPrep(pos_arr=pos, pos_shift=pos_shift, turnover=turnover, bar_cost=bar_cost)
+
+
+def apply(prep: BacktestPrep, ret: np.ndarray, starting_equity: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Run prepared positions over ret; returns (equity, net_ret).
+
+    NaN returns are skipped by the equity product the same way pandas'
+    cumprod does. The product always accumulates in float64, whatever the
+    input dtype.
+    """
+    # Apply returns with previous position for realistic fill at close
+    net_ret = prep.pos_shift * ret - prep.bar_cost
+    growth = 1 + net_ret
+    equity = np.nancumprod(growth, dtype=np.float64) * starting_equity
+    equity[np.isnan(growth)] = np.nan
+    return equity, net_ret
+
+
+@njit(cache=True)
+def _bt_core(ret: np.ndarray, pos: np.ndarray, per_trade_bps: float, starting_equity: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Fused single-pass backtest loop; same outputs as prepare() + apply().
+
+    No fastmath: the NaN checks that mirror pandas' cumprod must survive.
+    Per-bar outputs take ret's dtype; equity is always float64.
+    """
+    n = ret.shape[0]
+    equity = np.empty(n)
+    net_ret = np.empty(n, ret.dtype)
+    turnover = np.empty(n, ret.dtype)
+    costs = np.empty(n, ret.dtype)
+    prev = 0.0
+    running = starting_equity
+    for i in range(n):
+        turnover[i] = abs(pos[i] - prev)
+        costs[i] = turnover[i] * (per_trade_bps / 1e4)
+        net_ret[i] = prev * ret[i] - costs[i]
+        growth = 1.0 + net_ret[i]
+        if np.isnan(growth):
+            equity[i] = np.nan
+        else:
+            running *= growth
+            equity[i] = running
+        prev = pos[i]
+    return equity, net_ret, turnover, costs
+
+
+def run_backtest_arr(pos: np.ndarray, ret: np.ndarray, cost: Optional[CostModel] = None, starting_equity: float = 1.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Array core of run_backtest for positions already aligned with ret.
+
+    Returns (equity, net_ret, turnover, costs); equity is float64, the others
+    follow the input dtype. Uses the fused numba loop when available, else
+    the vectorized prepare/apply path.
+    """
+    cost = cost or CostModel()
+    if HAVE_NUMBA:
+        return _bt_core(ret, pos, cost.commission_bps + cost.slippage_bps, float(starting_equity))
+    prep = prepare(pos, cost)
+    equity, net_ret = apply(prep, ret, starting_equity)
+    return equity, net_ret, prep.turnover, prep.bar_cost
+
+
+def _ns(idx: pd.DatetimeIndex) -> np.ndarray:
+    return idx.values.astype("datetime64[ns]").view(np.int64)
+
+
+def _align_position(position: pd.Series, index: pd.Index) -> pd.Series:
+    """position.reindex(index).fillna(0.0).astype(float) without a hash join.
+
+    Strategies normally return positions on df.index itself, which needs no
+    alignment at all; sorted, unique DatetimeIndex pairs are matched with
+    searchsorted. Anything else goes through reindex.
+    """
+    src = position.index
+    if src.equals(index):
+        vals = position.to_numpy(dtype=np.float64, copy=True)
+    elif (
+        isinstance(src, pd.DatetimeIndex)
+        and isinstance(index, pd.DatetimeIndex)
+        and src.tz == index.tz
+        and src.is_monotonic_increasing
+        and index.is_monotonic_increasing
+        and src.is_unique
+    ):
+        src_ns = _ns(src)
+        dst_ns = _ns(index)
+        loc = np.searchsorted(src_ns, dst_ns)
+        np.minimum(loc, len(src_ns) - 1, out=loc)
+        hit = src_ns[loc] == dst_ns if len(src_ns) else np.zeros(len(dst_ns), dtype=bool)
+        vals = np.zeros(len(index))
+        vals[hit] = position.to_numpy(dtype=np.float64)[loc[hit]]
+    else:
+        return position.reindex(index).fillna(0.0).astype(float)
+    vals[np.isnan(vals)] = 0.0
+    return pd.Series(vals, index=index, name=position.name)
+
+
+def _ret_array(df: pd.DataFrame) -> np.ndarray:
+    """df['RetSimple'] as a C-contiguous float64 array, without copying the frame."""
+    if "RetSimple" not in df.columns:
+        raise ValueError("DataFrame must include RetSimple column; use data_loader.load_data")
+    ret = np.ascontiguousarray(df["RetSimple"].to_numpy(dtype=np.float64, copy=False))
+    if np.isnan(ret).all():
+        raise ValueError("RetSimple is empty or all NaN; use data_loader.load_data")
+    return ret
+
+
+def run_backtest(df: pd.DataFrame, position: pd.Series, cost: Optional[CostModel] = None, starting_equity: float = 1.0, dtype: np.dtype = np.float64) -> BacktestResult:
     """Vectorized backtest on Close-to-Close returns.
 
     - position: target position applied for holding period t->t+1
     - returns are simple returns df['RetSimple']
+    - dtype: working precision of returns, positions, turnover and costs.
+      np.float32 halves the memory traffic of long runs and sweeps at ~1e-7
+      relative precision per bar, enough for summary metrics but not for
+      bit-level comparisons; equity is compounded in float64 either way.
     Costs modeled by turnover = |pos_t - pos_{t-1}|.
     """
-    cost = cost or CostModel()
-    df = df.copy()
-    ret = df.get("RetSimple")
-    if ret is None or ret.isna().all():
-        raise ValueError("DataFrame must include RetSimple column; use data_loader.load_data")
-    pos = position.reindex(df.index).fillna(0.0).astype(float)
-    pos_shift = pos.shift(1).fillna(0.0)
-    # Apply returns with previous position for realistic fill at close
-    pnl = pos_shift * ret
-    turnover = (pos - pos_shift).abs()
-    per_trade_bps = cost.commission_bps + cost.slippage_bps
-    costs = turnover * (per_trade_bps / 1e4)
-    net_ret = pnl - costs
-    equity = (1 + net_ret).cumprod() * starting_equity
+    ret = _ret_array(df)
+    if ret.dtype != dtype:
+        ret = ret.astype(dtype)
+    pos = _align_position(position, df.index)
+    pos_arr = np.ascontiguousarray(pos.to_numpy(), dtype=dtype)
+    equity, net_ret, turnover, costs = run_backtest_arr(pos_arr, ret, cost, starting_equity)
     return BacktestResult(
-        equity=equity,
-        returns=net_ret,
+        equity=pd.Series(equity, index=df.index),
+        returns=pd.Series(net_ret, index=df.index),
         position=pos,
-        turnover=turnover,
-        costs=costs,
+        turnover=pd.Series(turnover, index=df.index),
+        costs=pd.Series(costs, index=df.index),
     )
+
+
+def run_backtest_batch(df: pd.DataFrame, position_matrix: np.ndarray, cost: Optional[CostModel] = None, starting_equity: float = 1.0) -> List[BacktestResult]:
+    """run_backtest for M strategies at once on the same df.
+
+    - position_matrix: (M, N) target positions, row i is strategy i, columns
+      aligned with df.index
+    All strategies are computed as one (M, N) array pass; results come back
+    in row order.
+    """
+    cost = cost or CostModel()
+    ret = _ret_array(df)
+    # own C-ordered copy: rows are walked bar by bar, and a Fortran-ordered
+    # matrix (e.g. DataFrame.to_numpy().T) would stride across memory
+    pos = np.nan_to_num(np.array(position_matrix, dtype=np.float64, order="C"), copy=False, nan=0.0)
+    if pos.ndim != 2 or pos.shape[1] != len(df):
+        raise ValueError(f"position_matrix must have shape (M, {len(df)}), got {pos.shape}")
+    pos_shift = np.zeros_like(pos)
+    pos_shift[:, 1:] = pos[:, :-1]
+    turnover = np.abs(pos - pos_shift)
+    costs = turnover * ((cost.commission_bps + cost.slippage_bps) / 1e4)
+    net_ret = pos_shift * ret[None, :] - costs
+    growth = 1 + net_ret
+    equity = np.nancumprod(growth, axis=1) * starting_equity
+    equity[np.isnan(growth)] = np.nan
+    return [
+        BacktestResult(
+            equity=pd.Series(equity[i], index=df.index),
+            returns=pd.Series(net_ret[i], index=df.index),
+            position=pd.Series(pos[i], index=df.index),
+            turnover=pd.Series(turnover[i], index=df.index),
+            costs=pd.Series(costs[i], index=df.index),
+        )
+        for i in range(pos.shape[0])
+    ]
+
+
+def _run_one(job: Tuple[np.ndarray, np.ndarray, Optional[CostModel], float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Worker for run_backtests_parallel; top-level so it pickles."""
+    pos, ret, cost, starting_equity = job
+    return run_backtest_arr(pos, ret, cost, starting_equity)
+
+
+def run_backtests_parallel(jobs: List[Tuple[pd.DataFrame, pd.Series, Optional[CostModel]]], starting_equity: float = 1.0, max_workers: Optional[int] = None) -> List[BacktestResult]:
+    """run_backtest over independent (df, position, cost) jobs in worker processes.
+
+    Only the aligned position and RetSimple arrays cross the process
+    boundary; results are wrapped back into BacktestResult in job order.
+    Workers are spawned, not forked: forking after a numba parallel kernel
+    (deep_test._cagr_rows) has started its thread pool hangs the parent at
+    exit. Scripts calling this need an ``if __name__ == "__main__":`` guard.
+    """
+    payloads = []
+    positions = []
+    for df, position, cost in jobs:
+        ret = _ret_array(df)
+        pos = _align_position(position, df.index)
+        positions.append(pos)
+        payloads.append((np.ascontiguousarray(pos.to_numpy(), dtype=np.float64), ret, cost, float(starting_equity)))
+    workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+        outputs = list(ex.map(_run_one, payloads, chunksize=max(1, len(payloads) // (4 * workers))))
+    results = []
+    for (df, _, _), pos, (equity, net_ret, turnover, costs) in zip(jobs, positions, outputs):
+        results.append(BacktestResult(
+            equity=pd.Series(equity, index=df.index),
+            returns=pd.Series(net_ret, index=df.index),
+            position=pos,
+            turnover=pd.Series(turnover, index=df.index),
+            costs=pd.Series(costs, index=df.index),
+        ))
+    return results
+
+
+@njit(cache=True)
+def _pnl_core(returns: np.ndarray, pos_shift: np.ndarray, bar_cost: np.ndarray, idx_ns: np.ndarray) -> float:
+    """CAGR of apply() on raw arrays, measured like compute_performance.
+
+    Fuses pnl, costs and the equity product into one pass so the Monte-Carlo
+    loops in deep_test never build a DataFrame per iteration. NaN growth is
+    skipped as in _bt_core, and the CAGR runs from the first to the last
+    non-NaN equity bar (idx_ns: int64 ns timestamps), like the dropna() in
+    compute_performance. No fastmath: the NaN checks must survive.
+    """
+    equity = 1.0
+    first = np.nan
+    lo = -1
+    hi = -1
+    for i in range(returns.shape[0]):
+        growth = 1.0 + pos_shift[i] * returns[i] - bar_cost[i]
+        if np.isnan(growth):
+            continue
+        equity *= growth
+        if lo < 0:
+            lo = i
+            first = equity
+        hi = i
+    if lo < 0:
+        return np.nan
+    return (equity / first) ** (1.0 / _years_ns(idx_ns[lo], idx_ns[hi])) - 1.0
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import time
 import warnings
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Tuple
 
 import pandas as pd
 import numpy as np
@@ -12,6 +16,14 @@ try:
 except Exception:  # pragma: no cover - optional dependency
     yf = None  # type: ignore
 
+try:
+    import pyarrow  # type: ignore
+    import pyarrow.csv as pa_csv  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    pyarrow = None  # type: ignore
+
+CACHE_DIR = Path(os.environ.get("OBGOLD_CACHE_DIR", "~/.cache/obgold")).expanduser()
+
 
 @dataclass
 class DataConfig:
@@ -20,6 +32,8 @@ class DataConfig:
     end: Optional[str] = None  # None = today
     timeframe: str = "1d"  # yfinance interval
     csv_path: Optional[str] = None
+    cache: bool = True  # parquet cache of the prepared frame under CACHE_DIR
+    cache_ttl: float = 12 * 3600.0  # seconds; only for open-ended (end=None) downloads
 
 
 def _from_yfinance(cfg: DataConfig) -> pd.DataFrame:
@@ -35,14 +49,28 @@ def _from_yfinance(cfg: DataConfig) -> pd.DataFrame:
 
 
 def _from_csv(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path)
+    # Header first, so column types can be handed to the parser instead of
+    # inferred. Dates stay text and go through pd.to_datetime below, which
+    # keeps UTC offsets as written (pyarrow's own inference shifts to UTC).
+    cols = list(pd.read_csv(path, nrows=0).columns)
     # Try common schemas
-    if "Date" in df.columns:
-        idx = pd.to_datetime(df["Date"])  # raises on failure
-        df = df.set_index(idx).drop(columns=["Date"])
-    elif df.columns[0].lower() in {"date", "datetime", "time"}:
-        idx = pd.to_datetime(df.iloc[:, 0])
-        df = df.set_index(idx).drop(columns=[df.columns[0]])
+    date_col = None
+    if "Date" in cols:
+        date_col = "Date"
+    elif cols and cols[0].lower() in {"date", "datetime", "time"}:
+        date_col = cols[0]
+    prices = [c for c in cols if c.lower() in {"open", "high", "low", "close", "adj close"}]
+    if pyarrow is not None:
+        # multi-threaded Arrow reader
+        types = {c: pyarrow.float64() for c in prices}
+        if date_col:
+            types[date_col] = pyarrow.string()
+        df = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(column_types=types, strings_can_be_null=True)).to_pandas()
+    else:
+        df = pd.read_csv(path, dtype={c: "float64" for c in prices})
+    if date_col:
+        idx = pd.to_datetime(df[date_col])  # raises on failure
+        df = df.set_index(idx).drop(columns=[date_col])
     df.index.name = "Date"
     # Ensure standard columns if present
     rename_map = {"open": "Open", "high": "High", "low": "Low", "close": "Close", "adj close": "Adj Close", "volume": "Volume"}
@@ -56,37 +84,98 @@ def _synthetic(n: int = 3000, start_price: float = 1500.0, seed: int = 42) -> pd
     mu = 0.0001
     sigma = 0.01
     rets = rng.normal(mu, sigma, size=n)
-    prices = start_price * np.exp(np.cumsum(rets))
+    close = np.exp(np.cumsum(rets, out=rets), out=rets)
+    close *= start_price
     idx = pd.date_range("2010-01-01", periods=n, freq="B")
-    close = pd.Series(prices, index=idx)
     high = close * (1 + rng.uniform(0, 0.01, size=n))
     low = close * (1 - rng.uniform(0, 0.01, size=n))
-    open_ = close.shift(1).fillna(close.iloc[0])
+    open_ = np.empty_like(close)
+    open_[:1] = close[:1]
+    open_[1:] = close[:-1]
     vol = rng.integers(1e3, 1e5, size=n)
     df = pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": vol}, index=idx)
     return df
 
 
+def _cache_path(cfg: DataConfig) -> Path:
+    csv_key = None
+    if cfg.csv_path:
+        # Absolute path plus size and mtime: the same relative name from another
+        # cwd, or an edited file, gets its own entry
+        csv_path = os.path.abspath(cfg.csv_path)
+        try:
+            st = os.stat(csv_path)
+            csv_key = (csv_path, st.st_size, st.st_mtime_ns)
+        except OSError:
+            csv_key = (csv_path, None, None)
+    key = repr((cfg.symbol, cfg.start, cfg.end, cfg.timeframe, csv_key))
+    return CACHE_DIR / f"{hashlib.sha1(key.encode()).hexdigest()}.parquet"
+
+
+def _cache_fresh(path: Path, cfg: DataConfig) -> bool:
+    if not path.exists():
+        return False
+    if cfg.csv_path:
+        # the key already pins the file's size and mtime
+        return os.path.exists(cfg.csv_path)
+    if cfg.end is None:
+        return time.time() - path.stat().st_mtime < cfg.cache_ttl
+    return True
+
+
+def _load_raw(cfg: DataConfig) -> Tuple[pd.DataFrame, bool]:
+    """Raw OHLCV plus whether it is real data worth caching (not the synthetic fallback)."""
+    if cfg.csv_path:
+        return _from_csv(cfg.csv_path), True
+    try:
+        return _from_yfinance(cfg), True
+    except Exception as e:
+        warnings.warn(f"Falling back to synthetic data due to: {e}")
+        return _synthetic(), False
+
+
 def load_data(cfg: DataConfig) -> pd.DataFrame:
     """Load OHLCV and compute returns.
 
     Returns DataFrame with columns: Open, High, Low, Close, Volume, Ret (log), RetSimple
     Index is DatetimeIndex (UTC-naive).
+    With cfg.cache and pyarrow installed, the prepared frame (returns
+    included) is kept as parquet under CACHE_DIR and memory-mapped back on
+    later calls with the same symbol/start/end/timeframe/csv_path.
     """
-    if cfg.csv_path:
-        df = _from_csv(cfg.csv_path)
-    else:
+    use_cache = cfg.cache and pyarrow is not None
+    path = _cache_path(cfg)
+    if use_cache and _cache_fresh(path, cfg):
         try:
-            df = _from_yfinance(cfg)
+            return pd.read_parquet(path, engine="pyarrow", memory_map=True)
         except Exception as e:
-            warnings.warn(f"Falling back to synthetic data due to: {e}")
-            df = _synthetic()
+            warnings.warn(f"Ignoring unreadable data cache {path}: {e}")
 
+    df, cacheable = _load_raw(cfg)
     df = df.sort_index()
     df = df[~df.index.duplicated(keep="last")]
-    # Fill minimal gaps sensibly
-    df = df.ffill().bfill()
-    df["RetSimple"] = df["Close"].pct_change().fillna(0.0)
-    # Log return; guard against non-finite values
-    df["Ret"] = np.log1p(df["RetSimple"]).replace([np.inf, -np.inf], 0.0).fillna(0.0)
+    # Fill minimal gaps sensibly; clean downloads skip the two frame copies
+    if df.isna().to_numpy().any():
+        df = df.ffill().bfill()
+    close = df["Close"].to_numpy(dtype=np.float64)
+    rs = np.empty_like(close)
+    lr = np.empty_like(close)
+    rs[:1] = 0.0
+    lr[:1] = 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # one Close ratio feeds both return columns
+        ratio = close[1:] / close[:-1]
+        np.subtract(ratio, 1.0, out=rs[1:])
+        rs[np.isnan(rs)] = 0.0
+        # Log return; guard against non-finite values
+        np.log(ratio, out=lr[1:])
+    np.nan_to_num(lr, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+    df["RetSimple"] = rs
+    df["Ret"] = lr
+    if use_cache and cacheable:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(path, engine="pyarrow")
+        except Exception as e:
+            warnings.warn(f"Could not write data cache {path}: {e}")
     return df
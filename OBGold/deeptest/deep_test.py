@@ -7,9 +7,10 @@ from typing import Dict, Any, Iterable, List, Tuple
 import numpy as np
 import pandas as pd
 
-from .backtester import run_backtest, CostModel
+from ._compat import njit, prange
+from .backtester import run_backtest, prepare, CostModel, _align_position, _ns, _pnl_core
 from .metrics import compute_performance, to_dict
-from .strategy_template import StrategyFn
+from .strategy_template import StrategyFn, frame_memo
 
 
 @dataclass
@@ -22,26 +23,27 @@ class WalkForwardConfig:
 def _year_slices(idx: pd.DatetimeIndex, years: int) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
     start = idx.min()
     end = idx.max()
-    slices = []
-    cur = start
-    while cur < end:
-        stop = cur + pd.DateOffset(years=years)
-        slices.append((cur, min(stop, end)))
-        cur = stop
-    return slices
+    step = pd.DateOffset(years=years)
+    # All slice boundaries in one call; the last one overshoots end
+    edges = pd.date_range(start=start, end=end + step, freq=step)
+    starts = edges[edges < end]
+    return [(cur, min(stop, end)) for cur, stop in zip(starts, edges[1:])]
 
 
 def grid_search(df: pd.DataFrame, strat: StrategyFn, grid: Dict[str, Iterable[Any]], cost: CostModel) -> Tuple[Dict[str, Any], Dict[str, float]]:
     keys = list(grid.keys())
     best: Tuple[Dict[str, Any], Dict[str, float]] | None = None
-    for values in product(*grid.values()):
-        params = dict(zip(keys, values))
-        pos = strat(df, params)
-        res = run_backtest(df, pos, cost)
-        perf = compute_performance(res.equity, res.returns)
-        perf_d = to_dict(perf)
-        if best is None or perf_d["CAGR"] > best[1]["CAGR"]:
-            best = (params, perf_d)
+    # df is fixed for the whole sweep, so built-in strategies may share
+    # indicator arrays across combos
+    with frame_memo():
+        for values in product(*grid.values()):
+            params = dict(zip(keys, values))
+            pos = strat(df, params)
+            res = run_backtest(df, pos, cost)
+            perf = compute_performance(res.equity, res.returns)
+            perf_d = to_dict(perf)
+            if best is None or perf_d["CAGR"] > best[1]["CAGR"]:
+                best = (params, perf_d)
     assert best is not None
     return best
 
@@ -56,8 +58,10 @@ def walk_forward(df: pd.DataFrame, strat: StrategyFn, grid: Dict[str, Iterable[A
         test_end = train_end + pd.DateOffset(years=cfg.test_years)
         if train_end >= idx.max() or train_start >= idx.max():
             break
-        df_train = df.loc[(df.index >= train_start) & (df.index < train_end)]
-        df_test = df.loc[(df.index >= train_end) & (df.index < min(test_end, idx.max()))]
+        # Half-open [start, end) windows via binary search on the sorted index
+        lo, mid, hi = idx.searchsorted([train_start, train_end, min(test_end, idx.max())], side="left")
+        df_train = df.iloc[lo:mid]
+        df_test = df.iloc[mid:hi]
         if len(df_train) < 50 or len(df_test) < 20:
             continue
         best_params, _ = grid_search(df_train, strat, grid, cost)
@@ -74,6 +78,16 @@ def walk_forward(df: pd.DataFrame, strat: StrategyFn, grid: Dict[str, Iterable[A
     return pd.DataFrame(rows)
 
 
+@njit(cache=True, parallel=True)
+def _cagr_rows(ret_matrix: np.ndarray, pos_shift: np.ndarray, bar_cost: np.ndarray, idx_ns: np.ndarray) -> np.ndarray:
+    """CAGR for each row of a (n_iter, n) matrix of resampled returns."""
+    n_iter = ret_matrix.shape[0]
+    out = np.empty(n_iter)
+    for k in prange(n_iter):
+        out[k] = _pnl_core(ret_matrix[k], pos_shift, bar_cost, idx_ns)
+    return out
+
+
 def permutation_test(df: pd.DataFrame, strat: StrategyFn, params: Dict[str, Any], cost: CostModel, n_iter: int = 500, block: int = 5, seed: int = 7) -> Dict[str, float]:
     """Shuffle returns in blocks to get p-value for performance under null."""
     rng = np.random.default_rng(seed)
@@ -84,17 +98,17 @@ def permutation_test(df: pd.DataFrame, strat: StrategyFn, params: Dict[str, Any]
     n = len(rets)
     block = max(1, int(block))
     blocks = int(np.ceil(n / block))
-    stats = []
-    for _ in range(n_iter):
-        order = rng.permutation(blocks)
-        reshuffled = np.concatenate([rets[i*block:(i+1)*block] for i in order])[:n]
-        df_shuf = df.copy()
-        df_shuf["RetSimple"] = reshuffled
-        res = run_backtest(df_shuf, pos, cost)
-        perf = to_dict(compute_performance(res.equity, res.returns))
-        stats.append(perf["CAGR"])
+    prep = prepare(_align_position(pos, df.index).to_numpy(), cost)
+    orders = rng.permuted(np.broadcast_to(np.arange(blocks), (n_iter, blocks)).copy(), axis=1)
+    # Gather padded blocks, then drop the padding of the short tail block
+    # wherever it landed so every row is an exact reordering of rets
+    rets_blocks = np.pad(rets, (0, blocks * block - n)).reshape(blocks, block)
+    keep = np.ones((blocks, block), dtype=bool)
+    keep[-1, n - (blocks - 1) * block:] = False
+    reshuffled = rets_blocks[orders][keep[orders]].reshape(n_iter, n)
+    stats = _cagr_rows(reshuffled, prep.pos_shift, prep.bar_cost, _ns(df.index))
     cagr_true = perf_true["CAGR"]
-    p_value = float((np.sum(np.array(stats) >= cagr_true) + 1) / (n_iter + 1))
+    p_value = float((np.sum(stats >= cagr_true) + 1) / (n_iter + 1))
     return {"CAGR_true": cagr_true, "p_value": p_value}
 
 
@@ -104,26 +118,14 @@ def bootstrap_ci(df: pd.DataFrame, strat: StrategyFn, params: Dict[str, Any], co
     rets = df["RetSimple"].values.astype(float)
     n = len(rets)
     block = max(1, int(block))
-    # Precompute variable-length blocks using starts
-    starts = list(range(0, n, block))
-    segments = [rets[s: min(s + block, n)] for s in starts]
-    seg_count = len(segments)
-    cagr_list = []
-    for _ in range(n_iter):
-        boot_parts = []
-        total_len = 0
-        # Sample with replacement until we have at least n points
-        while total_len < n:
-            i = int(rng.integers(0, seg_count))
-            seg = segments[i]
-            boot_parts.append(seg)
-            total_len += len(seg)
-        boot = np.concatenate(boot_parts)[:n]
-        df_b = df.copy()
-        df_b["RetSimple"] = boot
-        res = run_backtest(df_b, pos, cost)
-        perf = to_dict(compute_performance(res.equity, res.returns))
-        cagr_list.append(perf["CAGR"])
+    seg_count = int(np.ceil(n / block))
+    # Fixed-length blocks; the short tail block wraps around to the start
+    padded = np.concatenate([rets, rets[:seg_count * block - n]])
+    rets_blocks = padded.reshape(seg_count, block)
+    idx = rng.integers(0, seg_count, size=(n_iter, seg_count))
+    boot_matrix = rets_blocks[idx].reshape(n_iter, -1)[:, :n]
+    prep = prepare(_align_position(pos, df.index).to_numpy(), cost)
+    cagr_list = _cagr_rows(boot_matrix, prep.pos_shift, prep.bar_cost, _ns(df.index))
     lower = float(np.quantile(cagr_list, alpha/2))
     upper = float(np.quantile(cagr_list, 1 - alpha/2))
     return {"CAGR_CI_low": lower, "CAGR_CI_high": upper}
@@ -1,17 +1,18 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, NamedTuple
 
 import numpy as np
 import pandas as pd
 
+from ._compat import HAVE_NUMBA, njit
+
 
 TRADING_DAYS = 252
+DAY_NS = 86_400 * 10**9
 
 
-@dataclass
-class Performance:
+class Performance(NamedTuple):
     cagr: float
     sharpe: float
     sortino: float
@@ -25,10 +26,78 @@ class Performance:
     trades: int
 
 
+class _Stats(NamedTuple):
+    n: int
+    total: float
+    sumsq: float
+    down_sumsq: float
+    pos_count: int
+    neg_count: int
+    pos_sum: float
+    neg_sum: float
+
+
+@njit(cache=True)
+def _stats_core(r: np.ndarray) -> _Stats:
+    """One pass over r accumulating every moment compute_performance needs."""
+    total = 0.0
+    sumsq = 0.0
+    down_sumsq = 0.0
+    pos_count = 0
+    neg_count = 0
+    pos_sum = 0.0
+    neg_sum = 0.0
+    # branchless: return signs are close to random, so if/elif mispredicts
+    # about every other bar; selects compile to conditional moves instead
+    for i in range(r.shape[0]):
+        x = r[i]
+        sq = x * x
+        total += x
+        sumsq += sq
+        up = x > 0.0
+        dn = x < 0.0
+        pos_count += up
+        neg_count += dn
+        pos_sum += x if up else 0.0
+        neg_sum += x if dn else 0.0
+        down_sumsq += sq if dn else 0.0
+    return _Stats(r.shape[0], total, sumsq, down_sumsq, pos_count, neg_count, pos_sum, neg_sum)
+
+
+def _stats(r: np.ndarray) -> _Stats:
+    if HAVE_NUMBA:
+        return _stats_core(r)
+    # counts come from the gathered sizes, no separate reductions over masks
+    up = r[r > 0]
+    down = r[r < 0]
+    return _Stats(r.size, float(r.sum()), float(r @ r), float(down @ down),
+                  up.size, down.size, float(up.sum()), float(down.sum()))
+
+
+@njit(cache=True)
+def _years_ns(start_ns: int, end_ns: int) -> float:
+    """Whole calendar days between two int64 ns timestamps, in years, floored
+    to avoid division by zero."""
+    return max(((end_ns - start_ns) // DAY_NS) / 365.25, 1e-9)
+
+
+def span_years(idx: pd.DatetimeIndex) -> float:
+    """Calendar length of the index in years, floored to avoid division by zero.
+
+    Whole days between the end points, in int64 nanoseconds; no Timestamp or
+    Timedelta objects are built.
+    """
+    if not isinstance(idx, pd.DatetimeIndex):
+        raise TypeError(f"span_years needs a DatetimeIndex, got {type(idx).__name__}")
+    ends = idx.values[[0, -1]].astype("datetime64[ns]").view(np.int64)
+    return _years_ns(ends[0], ends[1])
+
+
 def drawdown(equity: pd.Series) -> pd.Series:
-    peak = equity.cummax()
-    dd = equity / peak - 1.0
-    return dd
+    eq = equity.to_numpy(dtype=float)
+    # fmax skips NaN bars like equity.cummax(); maximum would carry them forward
+    peak = np.fmax.accumulate(eq)
+    return pd.Series(eq / peak - 1.0, index=equity.index)
 
 
 def compute_performance(equity: pd.Series, returns: pd.Series) -> Performance:
@@ -37,35 +106,34 @@ def compute_performance(equity: pd.Series, returns: pd.Series) -> Performance:
     if len(equity) == 0:
         raise ValueError("empty equity curve")
     total_return = equity.iloc[-1] / equity.iloc[0] - 1
-    years = max((equity.index[-1] - equity.index[0]).days / 365.25, 1e-9)
+    years = span_years(equity.index)
     cagr = (1 + total_return) ** (1 / years) - 1
-    vol = returns.std(ddof=0) * np.sqrt(TRADING_DAYS)
-    sharpe = (returns.mean() * TRADING_DAYS) / (vol + 1e-12)
-    downside = returns.where(returns < 0, 0.0)
-    downside_vol = downside.std(ddof=0) * np.sqrt(TRADING_DAYS)
-    sortino = (returns.mean() * TRADING_DAYS) / (downside_vol + 1e-12)
-    dd = drawdown(equity)
+    st = _stats(np.ascontiguousarray(returns.to_numpy(dtype=float)))
+    n = max(st.n, 1)
+    mean = st.total / st.n if st.n else np.nan
+    # population (ddof=0) std from raw moments; downside keeps the zeros of
+    # returns.where(returns < 0, 0.0), hence the neg_sum term
+    vol = np.sqrt(max(st.sumsq / n - mean * mean, 0.0)) * np.sqrt(TRADING_DAYS)
+    sharpe = (mean * TRADING_DAYS) / (vol + 1e-12)
+    down_mean = st.neg_sum / n
+    downside_vol = np.sqrt(max(st.down_sumsq / n - down_mean * down_mean, 0.0)) * np.sqrt(TRADING_DAYS)
+    sortino = (mean * TRADING_DAYS) / (downside_vol + 1e-12)
+    dd = drawdown(equity).to_numpy()
     max_dd = dd.min()
-    # duration
-    dd_is = dd != 0
-    max_dd_days = 0
-    cur = 0
-    for flag in dd_is:
-        if flag:
-            cur += 1
-            max_dd_days = max(max_dd_days, cur)
-        else:
-            cur = 0
-    calmar = (returns.mean() * TRADING_DAYS) / (abs(max_dd) + 1e-12)
+    # duration: longest run of bars under water, from run start/end edges
+    under = np.concatenate(([0], (dd != 0).astype(np.int8), [0]))
+    edges = np.diff(under)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    max_dd_days = int((ends - starts).max()) if starts.size else 0
+    calmar = (mean * TRADING_DAYS) / (abs(max_dd) + 1e-12)
     # wins/losses by sign of return when position != 0
-    nonzero = returns[returns != 0]
-    wins = nonzero[nonzero > 0]
-    losses = nonzero[nonzero < 0]
-    win_rate = float(len(wins)) / max(len(nonzero), 1)
-    avg_win = wins.mean() if len(wins) else 0.0
-    avg_loss = losses.mean() if len(losses) else 0.0
+    nonzero = st.pos_count + st.neg_count
+    win_rate = float(st.pos_count) / max(nonzero, 1)
+    avg_win = st.pos_sum / st.pos_count if st.pos_count else 0.0
+    avg_loss = st.neg_sum / st.neg_count if st.neg_count else 0.0
     # trades approximated by turnover half-count (entry+exit = 2)
-    trades = int((returns.abs() > 0).sum())
+    trades = nonzero
     return Performance(
         cagr=float(cagr),
         sharpe=float(sharpe),
@@ -81,17 +149,12 @@ def compute_performance(equity: pd.Series, returns: pd.Series) -> Performance:
     )
 
 
+# to_dict keys, in Performance field order
+_KEYS = ("CAGR", "Sharpe", "Sortino", "Vol", "MaxDD", "MaxDD_Days", "Calmar", "WinRate", "AvgWin", "AvgLoss", "Trades")
+
+
 def to_dict(p: Performance) -> Dict[str, float]:
-    return {
-        "CAGR": p.cagr,
-        "Sharpe": p.sharpe,
-        "Sortino": p.sortino,
-        "Vol": p.vol,
-        "MaxDD": p.max_dd,
-        "MaxDD_Days": float(p.max_dd_days),
-        "Calmar": p.calmar,
-        "WinRate": p.win_rate,
-        "AvgWin": p.avg_win,
-        "AvgLoss": p.avg_loss,
-        "Trades": float(p.trades),
-    }
+    d = dict(zip(_KEYS, p))
+    d["MaxDD_Days"] = float(p.max_dd_days)
+    d["Trades"] = float(p.trades)
+    return d
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Callable, Dict, Any
+from typing import Callable, Dict, Any, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 
 
@@ -17,6 +19,61 @@ class StrategySpec:
     fn: StrategyFn
 
 
+# Single-frame memo of Close rolling means and MA spreads: grid_search calls
+# the strategy once per param combo on the same frame, so each window and
+# each (fast, slow) pair is computed once whatever the other params are.
+# Only active inside frame_memo(), so a frame edited in place between calls
+# outside such a scope is never served stale values.
+_FRAME_MEMO: Optional[Dict[str, Any]] = None
+
+
+@contextmanager
+def frame_memo() -> Iterator[None]:
+    """Share rolling means/spreads across strategy calls within the block."""
+    global _FRAME_MEMO
+    outer = _FRAME_MEMO
+    _FRAME_MEMO = {"df": None, "cache": {}}
+    try:
+        yield
+    finally:
+        _FRAME_MEMO = outer
+
+
+def _frame_cache(df: pd.DataFrame) -> Optional[Dict[Any, np.ndarray]]:
+    if _FRAME_MEMO is None:
+        return None
+    if _FRAME_MEMO["df"] is not df:
+        _FRAME_MEMO["df"] = df
+        _FRAME_MEMO["cache"] = {}
+    return _FRAME_MEMO["cache"]
+
+
+def _rolling_mean(df: pd.DataFrame, window: int) -> np.ndarray:
+    cache = _frame_cache(df)
+    key = ("mean", window)
+    if cache is not None and key in cache:
+        return cache[key]
+    close = df["Close"].astype(float)
+    out = close.rolling(window, min_periods=window).mean().to_numpy()
+    if cache is not None:
+        cache[key] = out
+    return out
+
+
+def _compute_spread(df: pd.DataFrame, fast: int, slow: int) -> np.ndarray:
+    """Relative MA spread (ma_fast - ma_slow) / ma_slow; NaN during warm-up."""
+    cache = _frame_cache(df)
+    key = ("spread", fast, slow)
+    if cache is not None and key in cache:
+        return cache[key]
+    ma_f = _rolling_mean(df, fast)
+    ma_s = _rolling_mean(df, slow)
+    out = (ma_f - ma_s) / ma_s
+    if cache is not None:
+        cache[key] = out
+    return out
+
+
 def ma_cross(df: pd.DataFrame, params: Dict[str, Any]) -> pd.Series:
     """Simple moving-average crossover strategy on Close.
 
@@ -29,19 +86,14 @@ def ma_cross(df: pd.DataFrame, params: Dict[str, Any]) -> pd.Series:
     fast = int(params.get("fast", 20))
     slow = int(params.get("slow", 100))
     nz_bps = float(params.get("neutral_zone", 0.0))
-    close = df["Close"].astype(float)
-    ma_f = close.rolling(fast, min_periods=fast).mean()
-    ma_s = close.rolling(slow, min_periods=slow).mean()
-    spread = (ma_f - ma_s) / ma_s
-    pos = pd.Series(0.0, index=df.index, dtype=float)
-    pos = pos.where(spread.isna(), pos)
-    buy = spread > (nz_bps / 1e4)
-    sell = spread < -(nz_bps / 1e4)
-    pos = pos.mask(buy, 1.0)
-    pos = pos.mask(sell, -1.0)
-    pos = pos.replace(0, pd.NA)
-    pos = pos.astype("Float64").ffill().fillna(0.0).astype(float)
-    return pos.clip(-1, 1)
+    spread = _compute_spread(df, fast, slow)
+    thr = nz_bps / 1e4
+    # NaN spread (warm-up) compares False on both sides -> no signal
+    signal = np.where(spread > thr, 1.0, np.where(spread < -thr, -1.0, 0.0))
+    # Forward-fill the last non-zero signal; leading bars stay flat
+    last = np.where(signal != 0, np.arange(len(signal)), 0)
+    np.maximum.accumulate(last, out=last)
+    return pd.Series(signal[last], index=df.index)
 
 
 BUILT_IN_STRATEGIES: Dict[str, StrategyFn] = {